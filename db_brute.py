@@ -6,123 +6,433 @@ For authorized security testing only.
 
 import sys
 import argparse
+import atexit
+import math
+import mmap
+import os
+import queue
+import re
 import shutil
+import socket
 import time
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from threading import Condition, Event, Lock, Semaphore, Thread, local
 
 from drivers import get_driver, list_drivers, HostUnreachable
 
 
 class Status:
-    """Thread-safe status tracker with terminal output."""
+    """
+    Thread-safe status tracker with terminal output.
+    Targets and credentials are passed as preformatted "host:port" and
+    "username:password" strings so nothing is formatted per attempt.
+    """
+
+    DRAW_INTERVAL = 0.05
+    LATENCY_SMOOTHING = 0.1
+    FLUSH_INTERVAL = 0.5
+    BUFFER_SIZE = 1 << 16
 
     def __init__(self, total: int, output_file: Path, log_file: Path = None):
         self.total = total
-        self.completed = 0
-        self.valid_count = 0
         self.output_file = output_file
         self.log_file = log_file
         self.lock = Lock()
-        self.unreachable_hosts = set()
-
-    def update(self, host: str, port: int, username: str, password: str, success: bool):
-        with self.lock:
-            self.completed += 1
-            target = f"{host}:{port}"
-
-            if self.log_file:
-                status_str = "SUCCESS" if success else "FAILED"
-                with open(self.log_file, 'a') as f:
-                    f.write(f"{status_str} {target} {username}:{password}\n")
-
-            if success:
-                self.valid_count += 1
-                with open(self.output_file, 'a') as f:
-                    f.write(f"{host}:{port}:{username}:{password}\n")
-                sys.stdout.write(f"\r\033[K[+] VALID: {target} - {username}:{password}\n")
-
-            self._draw_status(target, username, password)
-
-    def skip(self, host: str, port: int, username: str, password: str, reason: str = "unreachable"):
+        self.unreachable_hosts = frozenset()
+        self.found_hosts = frozenset()
+        self.found_users = frozenset()
+        # Called as (target, reason) the first time a target is marked unreachable
+        self.on_unreachable = None
+        self.stop_on_first = False
+        self.stop_on_first_per_user = False
+        # Consecutive timeouts after which a target counts as unreachable; 0 disables
+        self.max_timeouts = 0
+        self._timeouts = {}
+        # Moving average of driver call time, used to size an AdaptiveLimit
+        self.latency_ema = None
+        # First OSError hit by the writer thread, for the caller to report
+        self.write_error = None
+        # Counters are sharded per thread so recording an attempt takes no shared lock
+        self._local = local()
+        self._shards = []
+        self._shards_lock = Lock()
+        self._draw_lock = Lock()
+        self._last_draw = 0.0
+        # All file I/O happens on one writer thread so recording an attempt never
+        # waits on the disk; see _write_loop
+        self._log_fh = open(log_file, 'a', buffering=self.BUFFER_SIZE) if log_file else None
+        self._out_fh = None
+        self._write_q = queue.SimpleQueue()
+        self._closed = Event()
+        self._writer = Thread(target=self._write_loop, name="status-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    @property
+    def completed(self) -> int:
+        return sum(shard[0] for shard in self._shards)
+
+    @property
+    def valid_count(self) -> int:
+        return sum(shard[1] for shard in self._shards)
+
+    def _shard(self) -> list[int]:
+        """Return this thread's [completed, valid] counter pair."""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = [0, 0]
+            with self._shards_lock:
+                self._shards = self._shards + [shard]
+        return shard
+
+    def update(self, target: str, cred: str, success: bool):
+        shard = self._shard()
+        shard[0] += 1
+
+        if self.log_file:
+            status_str = "SUCCESS" if success else "FAILED"
+            self._write_q.put((False, f"{status_str} {target} {cred}\n"))
+
+        if success:
+            shard[1] += 1
+            self._write_q.put((True, f"{target}:{cred}\n"))
+            with self._draw_lock:
+                sys.stdout.write(f"\r\033[K[+] VALID: {target} - {cred}\n")
+                self._draw_status(target, cred)
+            return
+
+        self._maybe_draw(target, cred)
+
+    def skip(self, target: str, cred: str, reason: str = "unreachable"):
+        self._shard()[0] += 1
+
+        if self.log_file:
+            self._write_q.put((False, f"SKIPPED {target} {cred} {reason}\n"))
+
+        self._maybe_draw(target, cred)
+
+    def mark_unreachable(self, target: str, reason: str) -> bool:
         with self.lock:
-            self.completed += 1
-            target = f"{host}:{port}"
-
-            if self.log_file:
-                with open(self.log_file, 'a') as f:
-                    f.write(f"SKIPPED {target} {username}:{password} {reason}\n")
-
-            self._draw_status(target, username, password)
-
-    def mark_unreachable(self, host: str, port: int, reason: str) -> bool:
-        with self.lock:
-            target = f"{host}:{port}"
             if target in self.unreachable_hosts:
                 return False
-            self.unreachable_hosts.add(target)
+            self.unreachable_hosts = self.unreachable_hosts | {target}
+        with self._draw_lock:
             sys.stdout.write(f"\n[!] Marking {target} as unreachable: {reason}\n")
             sys.stdout.flush()
-            return True
-
-    def is_unreachable(self, host: str, port: int) -> bool:
-        with self.lock:
-            return f"{host}:{port}" in self.unreachable_hosts
+        if self.on_unreachable is not None:
+            self.on_unreachable(target, reason)
+        return True
+
+    def is_unreachable(self, target: str) -> bool:
+        # unreachable_hosts is only ever replaced, never mutated, so reads need no lock
+        return target in self.unreachable_hosts
+
+    def record_latency(self, seconds: float):
+        """Fold one driver call duration into latency_ema."""
+        # Unlocked on purpose: a lost update only drops one sample from the average
+        ema = self.latency_ema
+        self.latency_ema = seconds if ema is None else ema + self.LATENCY_SMOOTHING * (seconds - ema)
+
+    def record_timeout(self, target: str, timed_out: bool) -> bool:
+        """
+        Track back-to-back timed out attempts against a target.
+        Returns True when the target has just reached max_timeouts in a row.
+        """
+        # Unlocked on purpose: a racing update can only shift the streak by one
+        if not timed_out:
+            if self._timeouts.get(target):
+                self._timeouts[target] = 0
+            return False
+        streak = self._timeouts[target] = self._timeouts.get(target, 0) + 1
+        return self.max_timeouts > 0 and streak == self.max_timeouts
 
-    def set_current(self, host: str, port: int, username: str, password: str):
+    def mark_found(self, target: str, username: str):
+        """Record that a valid credential for username was found on target."""
         with self.lock:
-            self._draw_status(f"{host}:{port}", username, password)
-
-    def _draw_status(self, target: str, username: str, password: str):
-        pct = (self.completed / self.total) * 100 if self.total > 0 else 0
-        status = f"[{self.completed}/{self.total} ({pct:.1f}%)] Valid: {self.valid_count} | Testing: {target} - {username}:{password}"
+            self.found_hosts = self.found_hosts | {target}
+            self.found_users = self.found_users | {(target, username)}
+
+    def skip_reason(self, target: str, username: str) -> str:
+        """
+        Return why an attempt should be skipped, or None if it should run.
+        stop_on_first / stop_on_first_per_user skip a target, or a target and
+        username, once a valid credential has been found for it.
+        """
+        if target in self.unreachable_hosts:
+            return "unreachable"
+        if self.stop_on_first and target in self.found_hosts:
+            return "host already found"
+        if self.stop_on_first_per_user and (target, username) in self.found_users:
+            return "user already found"
+        return None
+
+    def set_current(self, target: str, cred: str):
+        self._maybe_draw(target, cred)
+
+    def _maybe_draw(self, target: str, cred: str):
+        """Redraw the status line unless one was drawn within DRAW_INTERVAL or a redraw is in progress."""
+        if time.monotonic() - self._last_draw < self.DRAW_INTERVAL:
+            return
+        if not self._draw_lock.acquire(blocking=False):
+            return
+        try:
+            self._draw_status(target, cred)
+        finally:
+            self._draw_lock.release()
+
+    def _draw_status(self, target: str, cred: str):
+        self._last_draw = time.monotonic()
+        completed = self.completed
+        pct = (completed / self.total) * 100 if self.total > 0 else 0
+        status = f"[{completed}/{self.total} ({pct:.1f}%)] Valid: {self.valid_count} | Testing: {target} - {cred}"
         cols = shutil.get_terminal_size((80, 24)).columns
         if len(status) > cols:
             status = status[:cols-3] + "..."
         sys.stdout.write(f"\r\033[K{status}")
         sys.stdout.flush()
 
+    def _write_loop(self):
+        """
+        Drain (is_valid, line) entries into the output and log files until a None arrives.
+        Valid credentials are flushed as they arrive, the log every FLUSH_INTERVAL seconds.
+        """
+        # A file that fails is dropped and the other one keeps being written;
+        # the first error is kept in write_error for the caller to report.
+        last_flush = time.monotonic()
+        out_failed = False
+        while True:
+            try:
+                entry = self._write_q.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                entry = ()
+            if entry is None:
+                break
+            if entry:
+                is_valid, line = entry
+                if is_valid and not out_failed:
+                    try:
+                        if self._out_fh is None:
+                            self._out_fh = open(self.output_file, 'a', buffering=self.BUFFER_SIZE)
+                        self._out_fh.write(line)
+                        self._out_fh.flush()
+                    except OSError as exc:
+                        self._write_failed(self._out_fh, exc)
+                        self._out_fh = None
+                        out_failed = True
+                elif not is_valid and self._log_fh is not None:
+                    try:
+                        self._log_fh.write(line)
+                    except OSError as exc:
+                        self._write_failed(self._log_fh, exc)
+                        self._log_fh = None
+            if self._log_fh is not None and time.monotonic() - last_flush >= self.FLUSH_INTERVAL:
+                try:
+                    self._log_fh.flush()
+                except OSError as exc:
+                    self._write_failed(self._log_fh, exc)
+                    self._log_fh = None
+                last_flush = time.monotonic()
+
+        for fh in (self._log_fh, self._out_fh):
+            if fh is not None:
+                try:
+                    fh.close()
+                except OSError as exc:
+                    self._write_failed(None, exc)
+
+    def _write_failed(self, fh, exc: OSError):
+        """Keep the first write error and close the file that raised it."""
+        if self.write_error is None:
+            self.write_error = exc
+        if fh is not None:
+            try:
+                fh.close()
+            except OSError:
+                pass
+
+    def close(self):
+        """Write out everything queued, then stop the writer thread and close the files."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._write_q.put(None)
+        self._writer.join()
+
     def finish(self):
-        with self.lock:
+        self.close()
+        with self._draw_lock:
             sys.stdout.write("\r\033[K")
             sys.stdout.flush()
 
 
+class AdaptiveLimit:
+    """
+    Concurrency gate whose limit follows observed attempt latency.
+    A controller thread resizes it every INTERVAL seconds to
+    target_qps * status.latency_ema attempts in flight (Little's law),
+    clamped to [1, maximum].
+    """
+
+    INTERVAL = 0.5
+
+    def __init__(self, status: Status, target_qps: float, maximum: int):
+        self.status = status
+        self.target_qps = target_qps
+        self.maximum = maximum
+        self.limit = 1
+        self._active = 0
+        self._cond = Condition()
+        self._stopped = Event()
+        self._controller = Thread(target=self._control_loop, name="adaptive-limit", daemon=True)
+
+    def __enter__(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def resize(self, limit: int):
+        with self._cond:
+            self.limit = limit
+            self._cond.notify_all()
+
+    def start(self):
+        self._controller.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._controller.join()
+
+    def _control_loop(self):
+        while not self._stopped.wait(self.INTERVAL):
+            latency = self.status.latency_ema
+            if latency is None:
+                continue
+            limit = max(1, min(self.maximum, math.ceil(self.target_qps * latency)))
+            if limit != self.limit:
+                self.resize(limit)
+
+
 def test_credential(driver, host: str, port: int, username: str, password: str,
-                    timeout: int, status: Status, delay: float = 0, host_lock: Lock = None) -> bool:
-    """Test a single credential against a target."""
-    lock = host_lock if host_lock is not None else Lock()
-    with lock:
+                    timeout: int, status: Status, delay: float = 0, host_slots: Semaphore = None,
+                    target: str = None, cred: str = None, limit: AdaptiveLimit = None) -> bool:
+    """
+    Test a single credential against a target.
+    host_slots bounds how many attempts may be in flight against this target at once.
+    target and cred are the preformatted "host:port" and "username:password"
+    strings; they are built here if not supplied.
+    limit, if given, additionally gates the driver call across all targets.
+    """
+    slots = host_slots if host_slots is not None else Semaphore(1)
+    target = target if target is not None else f"{host}:{port}"
+    cred = cred if cred is not None else f"{username}:{password}"
+    with slots:
         if delay > 0:
             time.sleep(delay)
-        if status.is_unreachable(host, port):
-            status.skip(host, port, username, password)
-            return False
-        status.set_current(host, port, username, password)
-        try:
-            success = driver.connect(host, port, username, password, timeout)
-        except HostUnreachable as exc:
-            status.mark_unreachable(host, port, str(exc))
-            status.skip(host, port, username, password, str(exc))
+        reason = status.skip_reason(target, username)
+        if reason is not None:
+            status.skip(target, cred, reason)
             return False
-        status.update(host, port, username, password, success)
+        status.set_current(target, cred)
+        with limit if limit is not None else nullcontext():
+            started = time.monotonic()
+            try:
+                success = driver.connect(host, port, username, password, timeout)
+            except HostUnreachable as exc:
+                status.mark_unreachable(target, str(exc))
+                status.skip(target, cred, str(exc))
+                return False
+            elapsed = time.monotonic() - started
+        status.record_latency(elapsed)
+        # Most drivers report timeouts as plain failures, so infer them from the elapsed time
+        timed_out = not (success or driver.reports_unreachable) and elapsed >= timeout * 0.9
+        if status.record_timeout(target, timed_out):
+            status.mark_unreachable(target, f"{status.max_timeouts} consecutive timeouts")
+        if success:
+            status.mark_found(target, username)
+        status.update(target, cred, success)
         return success
 
 
+def resolve_host(host: str) -> tuple[list[str], str]:
+    """
+    Resolve a hostname to its addresses, in the order connections should try them.
+    Returns (addresses, None), or ([], reason) if it cannot be resolved.
+    """
+    try:
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except OSError as exc:
+        return [], str(exc) or exc.__class__.__name__
+    return list(dict.fromkeys(info[4][0] for info in infos)), None
+
+
+def probe_target(addresses: list[str], port: int, timeout: int) -> tuple[str, str]:
+    """
+    Check that a target accepts TCP connections on one of its addresses.
+    Returns (address, None) for the first that does, otherwise (None, reason).
+    """
+    reason = "no addresses"
+    for address in addresses:
+        try:
+            sock = socket.create_connection((address, port), timeout=timeout)
+        except OSError as exc:
+            reason = str(exc) or exc.__class__.__name__
+            continue
+        sock.close()
+        return address, None
+    return None, reason
+
+
+def iter_attempts(credentials: list[tuple[str, str, str]], targets: list[tuple[str, int, str]]):
+    """
+    Yield (host, port, target, username, password, cred) attempts round-robin
+    across targets, from (username, password, cred) credentials and
+    (host, port, target) targets.
+    Consecutive attempts always hit different targets, so the first --threads
+    attempts spread over as many hosts as possible instead of queueing behind
+    one host's concurrency limit.
+    """
+    for username, password, cred in credentials:
+        for host, port, target in targets:
+            yield host, port, target, username, password, cred
+
+
+# "username:password" lines, ignoring surrounding whitespace and '#' comments.
+# Equivalent to line.strip().split(':', 1), but one regex pass per file.
+CREDENTIAL_LINE = re.compile(r'^(?![^\S\n]*#)[^\S\n]*([^:\n]*):((?:[^\n]*\S)?)[^\S\n]*$', re.MULTILINE)
+# Non-blank, non-comment lines with no ':' at all
+INVALID_CREDENTIAL_LINE = re.compile(r'^(?![^\S\n]*#)[^\S\n]*[^:\s][^:\n]*$', re.MULTILINE)
+
+
 def parse_credential_file(filepath: Path) -> list[tuple[str, str]]:
-    """Parse a credential file with username:password format."""
-    credentials = []
-    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-        for line_num, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            if ':' in line:
-                username, password = line.split(':', 1)
-                credentials.append((username, password))
-            else:
-                print(f"[!] Skipping invalid credential line {line_num} in {filepath}: missing ':'", file=sys.stderr)
+    """
+    Parse a credential file with username:password format.
+    The file is memory-mapped, decoded in one pass and scanned with
+    CREDENTIAL_LINE, so there is no per-line Python code on the common path.
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, 'utf-8', 'ignore')
+
+    credentials = CREDENTIAL_LINE.findall(text)
+
+    # Only look for bad lines if some line did not yield a credential
+    if len(credentials) < text.count('\n') + (not text.endswith('\n')):
+        line_num, pos = 1, 0
+        for match in INVALID_CREDENTIAL_LINE.finditer(text):
+            line_num += text.count('\n', pos, match.start())
+            pos = match.start()
+            print(f"[!] Skipping invalid credential line {line_num} in {filepath}: missing ':'", file=sys.stderr)
     return credentials
 
 
@@ -196,19 +506,40 @@ Examples:
                         help='Credential file (default: credz/<db>.txt)')
     parser.add_argument('--threads', type=int, default=1,
                         help='Number of concurrent threads (default: 1)')
+    parser.add_argument('--per-host-concurrency', type=int, default=1,
+                        help='Maximum concurrent attempts against a single target (default: 1)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Scale concurrency (up to --threads) to hold --target-qps given observed latency')
+    parser.add_argument('--target-qps', type=float, default=100,
+                        help='Attempts per second to aim for with --adaptive (default: 100)')
     parser.add_argument('--timeout', type=int, default=5,
                         help='Connection timeout in seconds (default: 5)')
+    parser.add_argument('--max-timeouts', type=int, default=5,
+                        help='Mark a target unreachable after this many consecutive timeouts, 0 to disable (default: 5)')
     parser.add_argument('-o', '--output', type=Path, default=Path('./valid_credz.txt'),
                         help='Output file for valid credentials (default: ./valid_credz.txt)')
     parser.add_argument('-l', '--log', type=Path, default=None,
                         help='Log file for all attempts (optional)')
     parser.add_argument('--delay', type=float, default=0,
                         help='Delay in seconds between attempts per thread (default: 0)')
+    parser.add_argument('--stop-on-first', action='store_true',
+                        help='Stop testing a target once one valid credential is found for it')
+    parser.add_argument('--stop-on-first-per-user', action='store_true',
+                        help='Stop testing a username on a target once a valid password is found for it')
+    parser.add_argument('--fast', action='store_true',
+                        help='Use raw protocol handshakes instead of client libraries where available (mysql, postgres)')
+    parser.add_argument('--no-probe', action='store_true',
+                        help='Skip the TCP reachability check run against each target before testing')
 
     args = parser.parse_args()
 
+    if args.per_host_concurrency < 1:
+        parser.error('--per-host-concurrency must be at least 1')
+    if args.target_qps <= 0:
+        parser.error('--target-qps must be positive')
+
     # Get driver
-    driver = get_driver(args.db)
+    driver = get_driver(args.db, fast=args.fast)
 
     # Set credential file
     cred_file = args.creds if args.creds else get_default_cred_file(args.db)
@@ -223,6 +554,8 @@ Examples:
 
     targets = parse_targets(args.target, args.target_file, driver.default_port, args.port)
     credentials = parse_credential_file(cred_file)
+    parsed_count = len(credentials)
+    credentials = list(dict.fromkeys(credentials))
 
     if not targets:
         print("[!] No targets specified", file=sys.stderr)
@@ -236,6 +569,8 @@ Examples:
 
     print(f"[*] Database: {driver.name.upper()}")
     print(f"[*] Targets: {len(targets)} | Credentials: {len(credentials)} ({cred_file.name}) | Total: {total_checks}")
+    if parsed_count != len(credentials):
+        print(f"[*] Dropped {parsed_count - len(credentials)} duplicate credentials")
     print(f"[*] Threads: {args.threads} | Output: {args.output}", end="")
     if args.log:
         print(f" | Log: {args.log}")
@@ -244,34 +579,118 @@ Examples:
     print("-" * 60)
 
     status = Status(total_checks, args.output, args.log)
+    status.stop_on_first = args.stop_on_first
+    status.stop_on_first_per_user = args.stop_on_first_per_user
+    status.max_timeouts = args.max_timeouts
+
+    # Resolve each hostname once so drivers connect to the address directly
+    # instead of repeating the lookup on every attempt
+    hosts = list(dict.fromkeys(host for host, _ in targets))
+    with ThreadPoolExecutor(max_workers=min(64, len(hosts))) as executor:
+        resolved = dict(zip(hosts, executor.map(resolve_host, hosts)))
+
+    # Format display strings once up front rather than on every attempt.
+    # From here on, host is what drivers connect to; target keeps the name given.
+    # A name with a single address is replaced by it; names with several are
+    # kept so drivers still try each one, unless the probe below picks one.
+    prepared = []
+    for host, port in targets:
+        target = f"{host}:{port}"
+        addresses, reason = resolved[host]
+        if reason is not None:
+            status.mark_unreachable(target, reason)
+        prepared.append((addresses[0] if len(addresses) == 1 else host, port, target))
+    credentials = [(username, password, f"{username}:{password}") for username, password in credentials]
+
+    if not args.no_probe:
+        to_probe = [i for i, (_, _, target) in enumerate(prepared) if not status.is_unreachable(target)]
+        with ThreadPoolExecutor(max_workers=max(1, min(64, len(to_probe)))) as executor:
+            results = executor.map(lambda i: probe_target(resolved[targets[i][0]][0], targets[i][1], args.timeout),
+                                   to_probe)
+            for i, (address, reason) in zip(to_probe, results):
+                _, port, target = prepared[i]
+                if reason is not None:
+                    status.mark_unreachable(target, reason)
+                else:
+                    prepared[i] = (address, port, target)
+    targets = prepared
+
+    host_slots = {target: Semaphore(args.per_host_concurrency) for _, _, target in targets}
+    pending_by_target = {target: {} for _, _, target in targets}
+
+    def cancel_pending(target: str, reason: str):
+        """Pull attempts that have not started yet for a dead target out of the executor queue."""
+        for future, cred in list(pending_by_target[target].items()):
+            if future.cancel():
+                status.skip(target, cred, reason)
+
+    status.on_unreachable = cancel_pending
+
+    # Only keep a small window of attempts queued so memory stays proportional
+    # to --threads rather than to targets * credentials. Finished futures are
+    # streamed back through a queue, so each completion costs O(1) instead of
+    # a wait() over the whole window.
+    attempts = iter_attempts(credentials, targets)
+    max_in_flight = 2 * args.threads
+    finished = queue.SimpleQueue()
+
+    def submit_next(executor: ThreadPoolExecutor) -> bool:
+        """Submit the next attempt for a reachable target. Returns False once attempts run out."""
+        for host, port, target, username, password, cred in attempts:
+            reason = status.skip_reason(target, username)
+            if reason is not None:
+                status.skip(target, cred, reason)
+                continue
+            future = executor.submit(
+                test_credential,
+                driver,
+                host,
+                port,
+                username,
+                password,
+                args.timeout,
+                status,
+                args.delay,
+                host_slots[target],
+                target,
+                cred,
+                limit
+            )
+            pending = pending_by_target[target]
+            pending[future] = cred
+            future.add_done_callback(lambda f, pending=pending: pending.pop(f, None))
+            future.add_done_callback(finished.put)
+            return True
+        return False
 
-    host_locks = {target: Lock() for target in targets}
+    limit = None
+    if args.adaptive:
+        limit = AdaptiveLimit(status, args.target_qps, args.threads)
+        limit.start()
 
     with ThreadPoolExecutor(max_workers=args.threads) as executor:
-        futures = []
-        for username, password in credentials:
-            for host, port in targets:
-                future = executor.submit(
-                    test_credential,
-                    driver,
-                    host,
-                    port,
-                    username,
-                    password,
-                    args.timeout,
-                    status,
-                    args.delay,
-                    host_locks[(host, port)]
-                )
-                futures.append(future)
-
-        for future in as_completed(futures):
-            future.result()
-
+        in_flight = 0
+        while in_flight < max_in_flight and submit_next(executor):
+            in_flight += 1
+
+        while in_flight:
+            future = finished.get()
+            in_flight -= 1
+            if not future.cancelled():
+                future.result()
+            while in_flight < max_in_flight and submit_next(executor):
+                in_flight += 1
+
+    if limit is not None:
+        limit.stop()
+    driver.close()
     status.finish()
     print("-" * 60)
     print(f"[*] Complete: {status.valid_count}/{total_checks} valid credentials found")
 
+    if status.write_error is not None:
+        print(f"[!] Error writing results: {status.write_error}", file=sys.stderr)
+        sys.exit(1)
     if status.valid_count > 0:
         print(f"[*] Valid credentials saved to: {args.output}")
         sys.exit(0)
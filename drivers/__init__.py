@@ -1,22 +1,41 @@
 from .base import DatabaseDriver, HostUnreachable
 from .mssql import MSSQLDriver
 from .mysql import MySQLDriver
+from .mysql_fast import MySQLFastDriver
 from .postgres import PostgresDriver
+from .postgres_fast import PostgresFastDriver
 from .ssh import SSHDriver
 
+# mysqlclient is optional; prefer it over PyMySQL when it is installed
+try:
+    from .mysql_c import MySQLCDriver
+except ImportError:
+    MySQLCDriver = None
+
 DRIVERS = {
     "mssql": MSSQLDriver,
-    "mysql": MySQLDriver,
+    "mysql": MySQLCDriver or MySQLDriver,
     "postgres": PostgresDriver,
     "ssh": SSHDriver,
 }
 
+# Drivers that speak the auth handshake directly instead of through the client library
+FAST_DRIVERS = {
+    "mysql": MySQLFastDriver,
+    "postgres": PostgresFastDriver,
+}
+
 
-def get_driver(name: str) -> DatabaseDriver:
-    """Get a driver instance by name."""
+def get_driver(name: str, fast: bool = False) -> DatabaseDriver:
+    """
+    Get a driver instance by name.
+    If fast is set and a raw-handshake driver exists for this database, use it.
+    """
     if name not in DRIVERS:
         available = ", ".join(DRIVERS.keys())
         raise ValueError(f"Unknown database: {name}. Available: {available}")
+    if fast and name in FAST_DRIVERS:
+        return FAST_DRIVERS[name]()
     return DRIVERS[name]()
 
 
@@ -10,6 +10,9 @@ class DatabaseDriver(ABC):
 
     name: str = ""
     default_port: int = 0
+    # True if connect() raises HostUnreachable for network failures itself,
+    # so a slow failed attempt is a real rejection rather than a timeout
+    reports_unreachable: bool = False
 
     @abstractmethod
     def connect(self, host: str, port: int, username: str, password: str, timeout: int = 5) -> bool:
@@ -19,9 +22,18 @@ class DatabaseDriver(ABC):
         """
         pass
 
-    @abstractmethod
     def get_error_message(self, exception: Exception) -> str:
         """
         Extract a human-readable error message from a connection exception.
+        Drivers whose library packs the message elsewhere override this.
+        """
+        if exception.args:
+            return str(exception.args[0])
+        return str(exception)
+
+    def close(self):
+        """
+        Release anything the driver keeps open between attempts.
+        Called once after all attempts have finished.
         """
         pass
@@ -25,9 +25,3 @@ class MSSQLDriver(DatabaseDriver):
             return False
         except pymssql.InterfaceError:
             return False
-
-    def get_error_message(self, exception: Exception) -> str:
-        """Extract error message from pymssql exception."""
-        if hasattr(exception, 'args') and exception.args:
-            return str(exception.args[0])
-        return str(exception)
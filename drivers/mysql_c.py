@@ -0,0 +1,33 @@
+import MySQLdb
+from .mysql import MySQLDriver
+
+
+class MySQLCDriver(MySQLDriver):
+    """
+    MySQL driver using mysqlclient.
+    mysqlclient wraps libmysqlclient and releases the GIL for the whole
+    connect, so handshakes on different threads actually run in parallel.
+    """
+
+    def connect(self, host: str, port: int, username: str, password: str, timeout: int = 5) -> bool:
+        """Attempt MySQL authentication."""
+        # libmysqlclient takes "localhost" to mean the Unix socket and ignores
+        # port; connect over TCP like PyMySQL does
+        if host.lower() == "localhost":
+            host = "127.0.0.1"
+        try:
+            conn = MySQLdb.connect(
+                host=host,
+                port=port,
+                user=username,
+                passwd=password,
+                connect_timeout=timeout,
+                read_timeout=timeout,
+                write_timeout=timeout
+            )
+            conn.close()
+            return True
+        except MySQLdb.OperationalError:
+            return False
+        except MySQLdb.InterfaceError:
+            return False
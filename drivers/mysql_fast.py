@@ -0,0 +1,189 @@
+import hashlib
+import socket
+import struct
+
+from .mysql import MySQLDriver
+
+# cryptography is only needed for full caching_sha2_password auth over plain TCP
+try:
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+except ImportError:
+    serialization = None
+
+CLIENT_LONG_PASSWORD = 0x00000001
+CLIENT_PROTOCOL_41 = 0x00000200
+CLIENT_SECURE_CONNECTION = 0x00008000
+CLIENT_PLUGIN_AUTH = 0x00080000
+CLIENT_FLAGS = CLIENT_LONG_PASSWORD | CLIENT_PROTOCOL_41 | CLIENT_SECURE_CONNECTION | CLIENT_PLUGIN_AUTH
+
+MAX_PACKET_SIZE = (1 << 24) - 1
+UTF8MB4_GENERAL_CI = 45
+SCRAMBLE_LENGTH = 20
+
+OK_PACKET = 0x00
+AUTH_MORE_DATA = 0x01
+AUTH_SWITCH_REQUEST = 0xfe
+ERR_PACKET = 0xff
+FAST_AUTH_SUCCESS = 0x03
+PERFORM_FULL_AUTH = 0x04
+REQUEST_PUBLIC_KEY = b"\x02"
+
+
+class _Unsupported(Exception):
+    """The server asked for something the raw handshake does not implement."""
+
+
+def _native_scramble(password: bytes, salt: bytes) -> bytes:
+    """mysql_native_password: SHA1(password) XOR SHA1(salt + SHA1(SHA1(password)))."""
+    if not password:
+        return b""
+    stage1 = hashlib.sha1(password).digest()
+    stage2 = hashlib.sha1(stage1).digest()
+    mix = hashlib.sha1(salt + stage2).digest()
+    return bytes(a ^ b for a, b in zip(stage1, mix))
+
+
+def _sha2_scramble(password: bytes, salt: bytes) -> bytes:
+    """caching_sha2_password: SHA256(password) XOR SHA256(SHA256(SHA256(password)) + salt)."""
+    if not password:
+        return b""
+    stage1 = hashlib.sha256(password).digest()
+    stage2 = hashlib.sha256(stage1).digest()
+    mix = hashlib.sha256(stage2 + salt).digest()
+    return bytes(a ^ b for a, b in zip(stage1, mix))
+
+
+def _rsa_encrypt_password(password: bytes, salt: bytes, public_key: bytes) -> bytes:
+    """Full caching_sha2_password auth without TLS: RSA-OAEP(password + NUL XOR salt)."""
+    if serialization is None:
+        raise _Unsupported("full caching_sha2_password auth needs the cryptography package")
+    message = password + b"\0"
+    message = bytes(b ^ salt[i % len(salt)] for i, b in enumerate(message))
+    key = serialization.load_pem_public_key(public_key)
+    return key.encrypt(message, padding.OAEP(mgf=padding.MGF1(hashes.SHA1()), algorithm=hashes.SHA1(), label=None))
+
+
+SCRAMBLERS = {
+    "mysql_native_password": _native_scramble,
+    "caching_sha2_password": _sha2_scramble,
+}
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionResetError("server closed the connection")
+        buf += chunk
+    return bytes(buf)
+
+
+def _read_packet(sock: socket.socket) -> tuple[int, bytes]:
+    """Read one packet, returning (sequence id, payload)."""
+    header = _recv_exact(sock, 4)
+    length = header[0] | header[1] << 8 | header[2] << 16
+    return header[3], _recv_exact(sock, length)
+
+
+def _send_packet(sock: socket.socket, seq: int, payload: bytes):
+    sock.sendall(struct.pack("<I", len(payload))[:3] + bytes([seq & 0xff]) + payload)
+
+
+def _parse_greeting(greeting: bytes) -> tuple[bytes, str]:
+    """Extract (salt, auth plugin name) from a protocol 10 initial handshake packet."""
+    pos = greeting.index(b"\0", 1) + 1 + 4  # server version, connection id
+    salt = greeting[pos:pos + 8]
+    pos += 9  # salt part 1 and filler
+    capabilities = struct.unpack_from("<H", greeting, pos)[0]
+    pos += 2
+    if not capabilities & CLIENT_PROTOCOL_41:
+        raise _Unsupported("server does not speak protocol 4.1")
+    pos += 3  # character set, status flags
+    capabilities |= struct.unpack_from("<H", greeting, pos)[0] << 16
+    pos += 2
+    salt_length = greeting[pos]
+    pos += 11  # salt length, reserved
+    if capabilities & CLIENT_SECURE_CONNECTION:
+        part2 = max(12, salt_length - 9)
+        salt += greeting[pos:pos + part2]
+        pos += part2 + 1
+    plugin = "mysql_native_password"
+    if capabilities & CLIENT_PLUGIN_AUTH:
+        end = greeting.find(b"\0", pos)
+        plugin = greeting[pos:end if end != -1 else None].decode("ascii", "replace")
+    return salt[:SCRAMBLE_LENGTH], plugin
+
+
+class MySQLFastDriver(MySQLDriver):
+    """
+    MySQL driver that speaks the handshake directly and stops at the auth result.
+    Handles mysql_native_password and caching_sha2_password, including the
+    RSA-encrypted full auth MySQL 8 asks for on every password missing from
+    its cache. Anything else (TLS-only accounts, other plugins, or full auth
+    without the cryptography package) falls back to PyMySQL.
+    """
+
+    def connect(self, host: str, port: int, username: str, password: str, timeout: int = 5) -> bool:
+        """Attempt MySQL authentication."""
+        try:
+            return self._authenticate(host, port, username, password, timeout)
+        # Malformed replies surface as parse errors; let the library driver judge them
+        except (_Unsupported, IndexError, ValueError, struct.error):
+            return super().connect(host, port, username, password, timeout)
+        except OSError:
+            return False
+
+    def _authenticate(self, host: str, port: int, username: str, password: str, timeout: int) -> bool:
+        secret = password.encode("utf-8")
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            seq, greeting = _read_packet(sock)
+            if greeting[0] == ERR_PACKET:
+                return False
+            if greeting[0] != 10:
+                raise _Unsupported(f"protocol version {greeting[0]}")
+            salt, plugin = _parse_greeting(greeting)
+            if plugin not in SCRAMBLERS:
+                plugin = "mysql_native_password"
+
+            auth = SCRAMBLERS[plugin](secret, salt)
+            response = (
+                struct.pack("<IIB23x", CLIENT_FLAGS, MAX_PACKET_SIZE, UTF8MB4_GENERAL_CI)
+                + username.encode("utf-8") + b"\0"
+                + bytes([len(auth)]) + auth
+                + plugin.encode("ascii") + b"\0"
+            )
+            _send_packet(sock, seq + 1, response)
+
+            while True:
+                seq, packet = _read_packet(sock)
+                if not packet:
+                    raise _Unsupported("empty packet")
+                if packet[0] == OK_PACKET:
+                    return True
+                if packet[0] == ERR_PACKET:
+                    return False
+                if packet[0] == AUTH_SWITCH_REQUEST and len(packet) > 1:
+                    end = packet.find(b"\0", 1)
+                    if end == -1:
+                        raise _Unsupported("malformed auth switch request")
+                    plugin = packet[1:end].decode("ascii", "replace")
+                    if plugin not in SCRAMBLERS:
+                        raise _Unsupported(f"auth plugin {plugin}")
+                    salt = packet[end + 1:end + 1 + SCRAMBLE_LENGTH]
+                    _send_packet(sock, seq + 1, SCRAMBLERS[plugin](secret, salt))
+                    continue
+                if packet[0] == AUTH_MORE_DATA and plugin == "caching_sha2_password":
+                    if packet[1:2] == bytes([FAST_AUTH_SUCCESS]):
+                        continue
+                    if packet[1:2] == bytes([PERFORM_FULL_AUTH]):
+                        # The key is fetched per attempt: a cached one could belong
+                        # to a different server behind the same name
+                        _send_packet(sock, seq + 1, REQUEST_PUBLIC_KEY)
+                        seq, packet = _read_packet(sock)
+                        if packet[:1] != bytes([AUTH_MORE_DATA]):
+                            raise _Unsupported("server did not send its public key")
+                        _send_packet(sock, seq + 1, _rsa_encrypt_password(secret, salt, packet[1:]))
+                        continue
+                raise _Unsupported(f"unexpected packet 0x{packet[0]:02x}")
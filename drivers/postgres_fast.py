@@ -0,0 +1,149 @@
+import base64
+import hashlib
+import hmac
+import os
+import socket
+import struct
+
+from .postgres import PostgresDriver
+
+PROTOCOL_VERSION_3 = 196608
+
+AUTH_OK = 0
+AUTH_CLEARTEXT = 3
+AUTH_MD5 = 5
+AUTH_SASL = 10
+AUTH_SASL_CONTINUE = 11
+AUTH_SASL_FINAL = 12
+
+SCRAM_MECHANISM = "SCRAM-SHA-256"
+
+# pg_hba rejections can depend on whether the client used SSL, which libpq
+# negotiates and the raw handshake does not.
+HBA_REJECT = "28000"
+
+
+class _Unsupported(Exception):
+    """The server asked for something the raw handshake does not implement."""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionResetError("server closed the connection")
+        buf += chunk
+    return bytes(buf)
+
+
+def _read_message(sock: socket.socket) -> tuple[bytes, bytes]:
+    """Read one backend message, returning (type byte, payload)."""
+    header = _recv_exact(sock, 5)
+    length = struct.unpack("!I", header[1:])[0]
+    return header[:1], _recv_exact(sock, length - 4)
+
+
+def _send_message(sock: socket.socket, kind: bytes, payload: bytes):
+    sock.sendall(kind + struct.pack("!I", len(payload) + 4) + payload)
+
+
+def _error_code(payload: bytes) -> str:
+    """Return the SQLSTATE field of an ErrorResponse payload."""
+    for field in payload.split(b"\0"):
+        if field[:1] == b"C":
+            return field[1:].decode("ascii", "replace")
+    return ""
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return bytes(x ^ y for x, y in zip(a, b))
+
+
+class PostgresFastDriver(PostgresDriver):
+    """
+    PostgreSQL driver that speaks the startup/auth exchange directly and stops
+    at AuthenticationOk. Handles cleartext, MD5 and SCRAM-SHA-256; anything
+    else (GSSAPI, channel binding, SSL-only pg_hba rules) falls back to psycopg2.
+    """
+
+    def connect(self, host: str, port: int, username: str, password: str, timeout: int = 5) -> bool:
+        """Attempt PostgreSQL authentication."""
+        try:
+            return self._authenticate(host, port, username, password, timeout)
+        # Malformed replies surface as parse errors; let the library driver judge them
+        except (_Unsupported, IndexError, ValueError, struct.error):
+            return super().connect(host, port, username, password, timeout)
+        except OSError:
+            return False
+
+    def _authenticate(self, host: str, port: int, username: str, password: str, timeout: int) -> bool:
+        user = username.encode("utf-8")
+        secret = password.encode("utf-8")
+        scram = None
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            startup = struct.pack("!I", PROTOCOL_VERSION_3) + b"user\0" + user + b"\0\0"
+            sock.sendall(struct.pack("!I", len(startup) + 4) + startup)
+
+            while True:
+                kind, payload = _read_message(sock)
+                if kind == b"E":
+                    if _error_code(payload) == HBA_REJECT:
+                        raise _Unsupported("rejected by pg_hba")
+                    return False
+                if kind == b"N":
+                    continue
+                if kind != b"R" or len(payload) < 4:
+                    raise _Unsupported(f"unexpected message {kind!r}")
+
+                code = struct.unpack_from("!I", payload)[0]
+                if code == AUTH_OK:
+                    return True
+                if code == AUTH_CLEARTEXT:
+                    _send_message(sock, b"p", secret + b"\0")
+                elif code == AUTH_MD5:
+                    inner = hashlib.md5(secret + user).hexdigest().encode("ascii")
+                    digest = hashlib.md5(inner + payload[4:8]).hexdigest().encode("ascii")
+                    _send_message(sock, b"p", b"md5" + digest + b"\0")
+                elif code == AUTH_SASL:
+                    mechanisms = payload[4:].split(b"\0")
+                    if SCRAM_MECHANISM.encode("ascii") not in mechanisms:
+                        raise _Unsupported("no supported SASL mechanism")
+                    scram = _ScramClient(secret)
+                    first = scram.client_first()
+                    _send_message(
+                        sock, b"p",
+                        SCRAM_MECHANISM.encode("ascii") + b"\0" + struct.pack("!i", len(first)) + first,
+                    )
+                elif code == AUTH_SASL_CONTINUE and scram is not None:
+                    _send_message(sock, b"p", scram.client_final(payload[4:]))
+                elif code == AUTH_SASL_FINAL and scram is not None:
+                    continue
+                else:
+                    raise _Unsupported(f"authentication method {code}")
+
+
+class _ScramClient:
+    """Client side of a SCRAM-SHA-256 exchange without channel binding."""
+
+    def __init__(self, password: bytes):
+        self.password = password
+        self.nonce = base64.b64encode(os.urandom(18))
+        self.client_first_bare = b"n=,r=" + self.nonce
+
+    def client_first(self) -> bytes:
+        return b"n,," + self.client_first_bare
+
+    def client_final(self, server_first: bytes) -> bytes:
+        attrs = dict(part.split(b"=", 1) for part in server_first.split(b",") if b"=" in part)
+        nonce = attrs.get(b"r", b"")
+        if not nonce.startswith(self.nonce) or b"s" not in attrs or b"i" not in attrs:
+            raise _Unsupported("malformed SCRAM server-first message")
+
+        salted = hashlib.pbkdf2_hmac("sha256", self.password, base64.b64decode(attrs[b"s"]), int(attrs[b"i"]))
+        client_key = hmac.digest(salted, b"Client Key", "sha256")
+        stored_key = hashlib.sha256(client_key).digest()
+        without_proof = b"c=biws,r=" + nonce
+        auth_message = self.client_first_bare + b"," + server_first + b"," + without_proof
+        signature = hmac.digest(stored_key, auth_message, "sha256")
+        return without_proof + b",p=" + base64.b64encode(_xor(client_key, signature))
@@ -1,52 +1,120 @@
 import logging
 import socket
+import threading
+from collections import OrderedDict
 
 import paramiko
 
 from .base import DatabaseDriver, HostUnreachable
 
+# Paramiko logs every failed negotiation; silence it once at import time
+_paramiko_logger = logging.getLogger("paramiko")
+_paramiko_logger.setLevel(logging.CRITICAL)
+_paramiko_logger.propagate = False
+
 
 class SSHDriver(DatabaseDriver):
-    """SSH driver using Paramiko."""
+    """
+    SSH driver using Paramiko.
+    Negotiated Transports are pooled per target and username (servers drop a
+    connection that switches username) and only the password auth request is
+    re-issued on them. A transport is checked out for one attempt at a time,
+    so a target never has more open than attempts in flight against it; at
+    most MAX_IDLE_TRANSPORTS idle ones are kept overall.
+    """
 
     name = "ssh"
     default_port = 22
+    reports_unreachable = True
+
+    MAX_AUTH_TRIES = 5
+    MAX_IDLE_TRANSPORTS = 64
+
+    def __init__(self):
+        # transport -> ((host, port, username), auth attempts made on it), oldest first
+        self._idle = OrderedDict()
+        self._idle_lock = threading.Lock()
 
     def connect(self, host: str, port: int, username: str, password: str, timeout: int = 5) -> bool:
         """Attempt SSH authentication."""
-        paramiko_logger = logging.getLogger("paramiko")
-        paramiko_logger.setLevel(logging.CRITICAL)
-        paramiko_logger.propagate = False
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        # A pooled transport may have been dropped by the server since its last
+        # use; that only shows up on the next request, so retry once on a fresh one.
+        for _ in range(2):
+            key = (host, port, username)
+            transport, attempts = self._checkout(key, timeout)
+            try:
+                remaining = transport.auth_password(username, password)
+            except (paramiko.AuthenticationException, paramiko.BadAuthenticationType):
+                # paramiko also reports a disconnect during auth this way; on a
+                # reused transport that means it went stale, not a wrong password
+                if attempts and not transport.is_active():
+                    transport.close()
+                    continue
+                self._checkin(key, transport, attempts + 1)
+                return False
+            except (paramiko.SSHException, socket.timeout, EOFError, OSError) as exc:
+                transport.close()
+                if attempts:
+                    continue
+                raise HostUnreachable(str(exc)) from exc
+            # Servers rarely allow re-authenticating an authenticated session,
+            # and a partial success leaves it mid-way through a multi-step auth.
+            transport.close()
+            return not remaining
+        raise HostUnreachable("connection dropped during authentication")
+
+    def _checkout(self, key: tuple[str, int, str], timeout: int) -> tuple[paramiko.Transport, int]:
+        """Take an idle transport for (host, port, username), or negotiate a new one. Returns (transport, attempts)."""
+        stale = []
+        found = None
+        with self._idle_lock:
+            for transport, (idle_key, attempts) in self._idle.items():
+                if idle_key == key:
+                    if transport.is_active():
+                        found = (transport, attempts)
+                        break
+                    stale.append(transport)
+            for transport in stale:
+                del self._idle[transport]
+            if found is not None:
+                del self._idle[found[0]]
+        for transport in stale:
+            transport.close()
+        if found is not None:
+            return found
+        return self._open_transport(key[0], key[1], timeout), 0
+
+    def _checkin(self, key: tuple[str, int, str], transport: paramiko.Transport, attempts: int):
+        """Return a transport to the idle pool, or close it if it is spent."""
+        if not transport.is_active() or attempts >= self.MAX_AUTH_TRIES:
+            transport.close()
+            return
+        evicted = []
+        with self._idle_lock:
+            self._idle[transport] = (key, attempts)
+            while len(self._idle) > self.MAX_IDLE_TRANSPORTS:
+                evicted.append(self._idle.popitem(last=False)[0])
+        for old in evicted:
+            old.close()
+
+    def _open_transport(self, host: str, port: int, timeout: int) -> paramiko.Transport:
+        transport = None
         try:
-            client.connect(
-                hostname=host,
-                port=port,
-                username=username,
-                password=password,
-                timeout=timeout,
-                auth_timeout=timeout,
-                banner_timeout=timeout,
-                allow_agent=False,
-                look_for_keys=False,
-            )
-            return True
-        except (paramiko.AuthenticationException, paramiko.BadAuthenticationType):
-            return False
-        except (
-            paramiko.SSHException,
-            paramiko.ssh_exception.NoValidConnectionsError,
-            socket.timeout,
-            ConnectionResetError,
-            OSError,
-        ) as exc:
+            sock = socket.create_connection((host, port), timeout=timeout)
+            transport = paramiko.Transport(sock)
+            transport.banner_timeout = timeout
+            transport.auth_timeout = timeout
+            transport.start_client(timeout=timeout)
+        except (paramiko.SSHException, socket.timeout, EOFError, OSError) as exc:
+            if transport is not None:
+                transport.close()
             raise HostUnreachable(str(exc)) from exc
-        finally:
-            client.close()
-
-    def get_error_message(self, exception: Exception) -> str:
-        """Extract error message from paramiko exception."""
-        if hasattr(exception, 'args') and exception.args:
-            return str(exception.args[0])
-        return str(exception)
+        return transport
+
+    def close(self):
+        """Close every idle pooled transport."""
+        with self._idle_lock:
+            transports = list(self._idle)
+            self._idle.clear()
+        for transport in transports:
+            transport.close()
@@ -0,0 +1,128 @@
+import hashlib
+import socket
+import struct
+import threading
+import unittest
+
+from drivers import mysql_fast
+from drivers.mysql_fast import MySQLFastDriver, _Unsupported, _native_scramble, _parse_greeting, _sha2_scramble
+
+SALT = b"ABCDEFGHIJKLMNOPQRST"
+
+# SELECT PASSWORD('password') on MySQL 5.x: SHA1(SHA1(password))
+NATIVE_STORED = bytes.fromhex("2470C0C06DEE42FD1618BB99005ADCA2EC9D1E19")
+
+
+def _greeting(plugin: bytes, capabilities: int = 0xdfffffff) -> bytes:
+    """Build a protocol 10 initial handshake packet the way mysqld sends it."""
+    return (
+        b"\x0a8.0.36\0" + struct.pack("<I", 7) + SALT[:8] + b"\0"
+        + struct.pack("<HBHH", capabilities & 0xffff, 0xff, 0x0002, capabilities >> 16)
+        + bytes([len(SALT) + 1]) + b"\0" * 10 + SALT[8:] + b"\0"
+        + plugin + b"\0"
+    )
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return bytes(x ^ y for x, y in zip(a, b))
+
+
+def _packet(seq: int, payload: bytes) -> bytes:
+    return struct.pack("<I", len(payload))[:3] + bytes([seq]) + payload
+
+
+def _read(conn: socket.socket) -> tuple[int, bytes]:
+    header = conn.recv(4, socket.MSG_WAITALL)
+    return header[3], conn.recv(int.from_bytes(header[:3], "little"), socket.MSG_WAITALL)
+
+
+class ScrambleTests(unittest.TestCase):
+
+    def test_native_scramble_passes_server_check(self):
+        # The server recovers SHA1(password) and compares its SHA1 to the stored hash
+        scramble = _native_scramble(b"password", SALT)
+        stage1 = _xor(scramble, hashlib.sha1(SALT + NATIVE_STORED).digest())
+        self.assertEqual(hashlib.sha1(stage1).digest(), NATIVE_STORED)
+
+    def test_sha2_scramble_passes_server_check(self):
+        stored = hashlib.sha256(hashlib.sha256(b"password").digest()).digest()
+        scramble = _sha2_scramble(b"password", SALT)
+        stage1 = _xor(scramble, hashlib.sha256(stored + SALT).digest())
+        self.assertEqual(hashlib.sha256(stage1).digest(), stored)
+
+    def test_empty_password_sends_empty_scramble(self):
+        self.assertEqual(_native_scramble(b"", SALT), b"")
+        self.assertEqual(_sha2_scramble(b"", SALT), b"")
+
+
+class ParseGreetingTests(unittest.TestCase):
+
+    def test_caching_sha2_greeting(self):
+        self.assertEqual(_parse_greeting(_greeting(b"caching_sha2_password")), (SALT, "caching_sha2_password"))
+
+    def test_native_password_greeting(self):
+        self.assertEqual(_parse_greeting(_greeting(b"mysql_native_password")), (SALT, "mysql_native_password"))
+
+    def test_pre_41_server_is_unsupported(self):
+        with self.assertRaises(_Unsupported):
+            _parse_greeting(_greeting(b"mysql_native_password", capabilities=0))
+
+    def test_truncated_greeting_raises_parse_error(self):
+        with self.assertRaises((IndexError, struct.error)):
+            _parse_greeting(_greeting(b"caching_sha2_password")[:20])
+
+
+@unittest.skipIf(mysql_fast.serialization is None, "cryptography is not installed")
+class FullAuthTests(unittest.TestCase):
+    """caching_sha2_password full auth against a server whose cache is always empty."""
+
+    @classmethod
+    def setUpClass(cls):
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+        cls.key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        cls.pem = cls.key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        cls.oaep = padding.OAEP(mgf=padding.MGF1(hashes.SHA1()), algorithm=hashes.SHA1(), label=None)
+
+    def _decrypt(self, encrypted: bytes) -> bytes:
+        message = self.key.decrypt(encrypted, self.oaep)
+        return bytes(b ^ SALT[i % len(SALT)] for i, b in enumerate(message))
+
+    def _serve(self, listener: socket.socket, password: bytes):
+        conn, _ = listener.accept()
+        with conn:
+            conn.sendall(_packet(0, _greeting(b"caching_sha2_password")))
+            _read(conn)
+            conn.sendall(_packet(2, b"\x01\x04"))
+            seq, request = _read(conn)
+            self.assertEqual((seq, request), (3, b"\x02"))
+            conn.sendall(_packet(4, b"\x01" + self.pem))
+            seq, encrypted = _read(conn)
+            ok = self._decrypt(encrypted) == password + b"\0"
+            conn.sendall(_packet(seq + 1, b"\x00\x00\x00\x02\x00" if ok else b"\xff\x15\x04#28000Access denied"))
+
+    def _attempt(self, password: str) -> bool:
+        with socket.create_server(("127.0.0.1", 0)) as listener:
+            server = threading.Thread(target=self._serve, args=(listener, b"secret"))
+            server.start()
+            try:
+                return MySQLFastDriver().connect("127.0.0.1", listener.getsockname()[1], "root", password, 2)
+            finally:
+                server.join()
+
+    def test_encrypted_password_round_trips(self):
+        encrypted = mysql_fast._rsa_encrypt_password(b"a much longer password than the salt", SALT, self.pem)
+        self.assertEqual(self._decrypt(encrypted), b"a much longer password than the salt\0")
+
+    def test_correct_password_is_accepted(self):
+        self.assertTrue(self._attempt("secret"))
+
+    def test_wrong_password_is_rejected_without_fallback(self):
+        self.assertIs(self._attempt("nope"), False)
+
+
+if __name__ == "__main__":
+    unittest.main()
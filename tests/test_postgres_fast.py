@@ -0,0 +1,48 @@
+import unittest
+
+from drivers.postgres_fast import _error_code, _ScramClient, _Unsupported
+
+# RFC 7677 section 3 SCRAM-SHA-256 example exchange
+RFC_CLIENT_NONCE = b"rOprNGfwEbeRWgbNEkqO"
+RFC_SERVER_FIRST = b"r=rOprNGfwEbeRWgbNEkqO%hvYDpWUa2RaTCAfuxFIlj)hNlF$k0,s=W22ZaJ0SNY7soEsUEjb6gQ==,i=4096"
+RFC_CLIENT_FINAL = (
+    b"c=biws,r=rOprNGfwEbeRWgbNEkqO%hvYDpWUa2RaTCAfuxFIlj)hNlF$k0,"
+    b"p=dHzbZapWIk4jUhN+Ute9ytag9zjfMHgsqmmiz7AndVQ="
+)
+
+
+def _rfc_client() -> _ScramClient:
+    client = _ScramClient(b"pencil")
+    # The RFC exchange names its user; PostgreSQL sends an empty one
+    client.nonce = RFC_CLIENT_NONCE
+    client.client_first_bare = b"n=user,r=" + RFC_CLIENT_NONCE
+    return client
+
+
+class ScramClientTests(unittest.TestCase):
+
+    def test_client_final_matches_rfc7677(self):
+        self.assertEqual(_rfc_client().client_final(RFC_SERVER_FIRST), RFC_CLIENT_FINAL)
+
+    def test_client_first_has_no_channel_binding(self):
+        client = _ScramClient(b"pencil")
+        self.assertEqual(client.client_first(), b"n,,n=,r=" + client.nonce)
+
+    def test_server_nonce_must_extend_client_nonce(self):
+        with self.assertRaises(_Unsupported):
+            _rfc_client().client_final(RFC_SERVER_FIRST.replace(b"r=rOpr", b"r=xOpr"))
+
+    def test_missing_salt_is_unsupported(self):
+        with self.assertRaises(_Unsupported):
+            _rfc_client().client_final(b"r=" + RFC_CLIENT_NONCE + b"abc,i=4096")
+
+
+class ErrorCodeTests(unittest.TestCase):
+
+    def test_sqlstate_field(self):
+        payload = b"SFATAL\0VFATAL\0C28P01\0Mpassword authentication failed\0\0"
+        self.assertEqual(_error_code(payload), "28P01")
+
+
+if __name__ == "__main__":
+    unittest.main()